@@ -8,7 +8,8 @@ Ember_Stats.html dashboard can filter by league.
 Leagues: Scorch, Magma, Cinder, Blaze
 
 SETUP:
-1. pip install requests gspread google-auth
+1. pip install "httpx[http2]" orjson gspread google-auth
+   (riot_stats_core.py must sit next to this file)
 2. Set up Google Sheets API credentials (credentials.json)
 3. Set RIOT_API_KEY, SPREADSHEET_NAME, LEAGUE_NAME
 4. Add player Riot IDs to PLAYER_RIOT_IDS
@@ -18,13 +19,17 @@ SETUP:
 Run once per league per game night, changing LEAGUE_NAME each time.
 """
 
-import requests
-import gspread
-import time
-import sys
+import asyncio
+import httpx
 import os
-from datetime import datetime, timedelta, timezone
-from google.oauth2.service_account import Credentials
+from datetime import datetime
+from riot_stats_core import (
+    REGION, PLATFORM, TZ, YN, STAT_HEADERS,
+    set_api_key, resp_json, get_game_time_windows, split_windows, get_puuid_from_riot_id,
+    get_history_queues, get_all_match_ids, make_async_client, Backpressure,
+    open_cache, riot_get_cached, get_match_details, is_inhouse_game,
+    connect_to_sheet, write_to_sheet,
+)
 
 # ============================================================
 # LOAD ENV VARIABLES
@@ -38,7 +43,6 @@ SPREADSHEET_NAME = "Ember Tournament Stats"
 # CONFIG
 # ============================================================
 
-REGION = "americas"
 WORKSHEET_NAME = "Sheet1"
 
 # Which league is this run for? (Scorch, Magma, Cinder, or Blaze)
@@ -57,9 +61,11 @@ TARGET_DATES = [
     # "2026-04-07",
 ]
 
-GAME_TIMEZONE_OFFSET = -5  # EST
 CUSTOM_QUEUE_IDS = [3130]
-API_DELAY = 1.5
+# Only page match history for CUSTOM_QUEUE_IDS + 0 (custom games); False = all queues
+FILTER_QUEUES_SERVER_SIDE = True
+
+# Region, timezone, rate limits and the match cache live in riot_stats_core.py
 
 TIMELINE_INTERVALS = [5, 10, 15, 20]
 
@@ -74,12 +80,12 @@ def fetch_champion_id_map():
     """Fetch champion ID to name mapping from Riot Data Dragon."""
     try:
         versions_url = "https://ddragon.leagueoflegends.com/api/versions.json"
-        resp = requests.get(versions_url, timeout=10)
-        latest_version = resp.json()[0]
+        resp = httpx.get(versions_url, timeout=10)
+        latest_version = resp_json(resp)[0]
 
         champ_url = f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json"
-        resp = requests.get(champ_url, timeout=10)
-        champ_data = resp.json()["data"]
+        resp = httpx.get(champ_url, timeout=10)
+        champ_data = resp_json(resp)["data"]
 
         id_to_name = {}
         for champ_name, champ_info in champ_data.items():
@@ -92,116 +98,16 @@ def fetch_champion_id_map():
         print(f"  [WARN] Could not fetch champion ID map: {e}")
         return {}
 
-# ============================================================
-# RIOT API FUNCTIONS
-# ============================================================
-
-HEADERS = {"X-Riot-Token": RIOT_API_KEY}
-
-
-def get_game_time_windows(day_of_week):
-    tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
-    windows = []
-    if TARGET_DATES:
-        for date_str in TARGET_DATES:
-            target_day = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=tz)
-            start = target_day.replace(hour=12, minute=0, second=0, microsecond=0)
-            end = (target_day + timedelta(days=1)).replace(hour=5, minute=0, second=0, microsecond=0)
-            windows.append((int(start.timestamp()), int(end.timestamp())))
-    else:
-        today = datetime.now(tz)
-        days_since = (today.weekday() - day_of_week) % 7
-        if days_since == 0 and today.hour < 12:
-            days_since = 7
-        target_day = today - timedelta(days=days_since)
-        start = target_day.replace(hour=12, minute=0, second=0, microsecond=0)
-        end = (target_day + timedelta(days=1)).replace(hour=5, minute=0, second=0, microsecond=0)
-        windows.append((int(start.timestamp()), int(end.timestamp())))
-    windows.sort(key=lambda w: w[0])
-    return windows
-
-
-def get_puuid_from_riot_id(riot_id):
-    parts = riot_id.split("#")
-    if len(parts) != 2:
-        print(f"  [ERROR] Invalid Riot ID format: '{riot_id}'")
-        return None
-    game_name, tag_line = parts
-    url = f"https://{REGION}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    resp = requests.get(url, headers=HEADERS)
-    if resp.status_code == 200:
-        return resp.json().get("puuid")
-    else:
-        print(f"  [ERROR] Failed to look up '{riot_id}': {resp.status_code}")
-        return None
-
-
-def get_all_match_ids(puuid, earliest_timestamp):
-    all_ids = []
-    start_index = 0
-    batch_size = 99
-    while True:
-        url = f"https://{REGION}.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids"
-        params = {"start": start_index, "count": batch_size}
-        resp = requests.get(url, headers=HEADERS, params=params)
-        time.sleep(API_DELAY)
-        if resp.status_code != 200:
-            break
-        batch = resp.json()
-        if not batch:
-            break
-        all_ids.extend(batch)
-        print(f"    Fetched {len(batch)} matches (total: {len(all_ids)})")
-        last_match_url = f"https://{REGION}.api.riotgames.com/lol/match/v5/matches/{batch[-1]}"
-        last_resp = requests.get(last_match_url, headers=HEADERS)
-        time.sleep(API_DELAY)
-        if last_resp.status_code == 200:
-            last_ts = last_resp.json().get("info", {}).get("gameStartTimestamp", 0) / 1000
-            if last_ts < earliest_timestamp:
-                break
-        if len(batch) < batch_size:
-            break
-        start_index += batch_size
-    return all_ids
-
-
-def get_match_details(match_id):
-    url = f"https://{REGION}.api.riotgames.com/lol/match/v5/matches/{match_id}"
-    resp = requests.get(url, headers=HEADERS)
-    if resp.status_code == 200:
-        return resp.json()
-    else:
-        print(f"  [ERROR] Match details failed for '{match_id}': {resp.status_code}")
-        return None
-
-
-def is_inhouse_game(match_data, windows):
-    info = match_data.get("info", {})
-    queue_id = info.get("queueId", -1)
-    game_type = info.get("gameType", "")
-    is_custom = queue_id in CUSTOM_QUEUE_IDS or game_type == "CUSTOM_GAME"
-    if not is_custom:
-        return False
-    game_start = info.get("gameStartTimestamp", 0) / 1000
-    for start_time, end_time in windows:
-        if start_time <= game_start <= end_time:
-            return True
-    return False
-
-
 # ============================================================
 # TIMELINE DATA
 # ============================================================
 
-def get_match_timeline(match_id):
+async def get_match_timeline(client, limiter, db, match_id):
     url = f"https://{REGION}.api.riotgames.com/lol/match/v5/matches/{match_id}/timeline"
-    resp = requests.get(url, headers=HEADERS)
-    time.sleep(API_DELAY)
-    if resp.status_code == 200:
-        return resp.json()
-    else:
+    data, resp = await riot_get_cached(client, limiter, db, url, f"{match_id}/timeline")
+    if resp is not None:
         print(f"  [WARN] Could not fetch timeline for {match_id}: {resp.status_code}")
-        return None
+    return data
 
 
 def parse_timeline_data(timeline_data):
@@ -322,58 +228,7 @@ def compute_team_totals(participants):
 # STAT EXTRACTION
 # ============================================================
 
-STAT_HEADERS = [
-    "Date", "Match ID", "Game Duration (min)",
-    "Team", "Teams", "Summoner Name", "Tag", "Champion", "Role", "Champion Level",
-    "Kills", "Deaths", "Assists", "KDA", "Solo Kills", "Kill Participation %",
-    "Double Kills", "Triple Kills", "Quadra Kills", "Penta Kills",
-    "Largest Multi Kill", "Largest Killing Spree",
-    "First Blood Kill", "First Blood Assist",
-    "Total Damage to Champions", "Damage/min", "Damage Share %",
-    "Physical Damage", "Magic Damage", "True Damage",
-    "Largest Critical Strike", "Damage Per Gold",
-    "Damage Taken", "Damage Taken/min", "Damage Mitigated",
-    "Total Healing", "Healing on Teammates", "Shielding on Teammates",
-    "Time CCing Others (s)", "Total CC Dealt (s)",
-    "Gold Earned", "Gold/min", "Gold Share %",
-    "Gold Spent", "Consumables Purchased", "Items Purchased",
-    "CS", "CS/min", "Lane Minions Killed", "Neutral Minions Killed",
-    "CS@5", "CS@10", "CS@15", "CS@20",
-    "Gold@5", "Gold@10", "Gold@15", "Gold@20",
-    "XP@5", "XP@10", "XP@15", "XP@20",
-    "Turret Plates Destroyed", "Level 6 Timing (min)",
-    "Vision Score", "Vision Score/min",
-    "Wards Placed", "Wards Killed", "Control Wards Bought",
-    "Detector Wards Placed", "Stealth Wards Placed",
-    "Turret Kills", "Turret Damage", "Objective Damage",
-    "Inhibitor Kills", "Nexus Kills",
-    "Objectives Stolen", "Objectives Stolen Assists",
-    "Baron Kills", "Dragon Kills",
-    "Spell1 Casts (Q)", "Spell2 Casts (W)", "Spell3 Casts (E)", "Spell4 Casts (R)",
-    "Summoner1 Casts", "Summoner2 Casts",
-    "Longest Time Alive (s)", "Total Time Dead (s)",
-    "Lane Minions First 10 Min", "Jungle CS Before 10 Min",
-    "Max CS Advantage on Lane Opponent", "Max Level Lead on Lane Opponent",
-    "Skillshots Hit", "Skillshots Dodged",
-    "Damage Per Minute (challenges)", "Team Damage %",
-    "KDA (challenges)", "Kill Participation (challenges)",
-    "Effective Heal and Shield", "Bounty Gold",
-    "Vision Score Advantage Over Lane Opponent",
-    "Control Wards Placed (challenges)", "Wards Guarded",
-    "First Turret Killed", "First Turret Killed Assist",
-    "Turret Plates Taken (challenges)", "Solo Turrets Late Game", "Turret Takedowns",
-    "Game Ended In Surrender", "Game Ended In Early Surrender",
-    "All In Pings", "Assist Me Pings", "Danger Pings",
-    "Enemy Missing Pings", "Enemy Vision Pings",
-    "On My Way Pings", "Push Pings", "Need Vision Pings",
-    "Team Dragons", "Team First Dragon", "Team Barons", "Team First Baron",
-    "Team Heralds", "Team First Herald", "Team Grubs", "Team First Grubs",
-    "Team Towers", "Team First Tower", "Team First Blood",
-    "Win",
-    "Season", "Season Phase", "League",
-    # ── Bans (same for all 5 players on that team in that match) ──
-    "Ban 1", "Ban 2", "Ban 3", "Ban 4", "Ban 5",
-]
+EMPTY_TEAM_CELLS = (0, "No", 0, "No", 0, "No", 0, "No", 0, "No", "No")
 
 
 def extract_stats(match_data, solo_kills=None, interval_stats=None,
@@ -388,15 +243,27 @@ def extract_stats(match_data, solo_kills=None, interval_stats=None,
     match_id = match_data.get("metadata", {}).get("matchId", "Unknown")
     game_duration_min = round(info.get("gameDuration", 0) / 60, 1)
 
-    tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
     game_start = info.get("gameStartTimestamp", 0) / 1000
-    game_date = datetime.fromtimestamp(game_start, tz=tz).strftime("%Y-%m-%d %I:%M %p")
+    game_date = datetime.fromtimestamp(game_start, tz=TZ).strftime("%Y-%m-%d %I:%M %p")
 
     team_obj = get_team_objectives(match_data)
     team_bans = get_team_bans(match_data)
     participants = info.get("participants", [])
     team_totals = compute_team_totals(participants)
 
+    # Team objective columns are identical for everyone on a team, so build them once
+    team_cells = {
+        team_id: (
+            t["dragons"], YN[bool(t["firstDragon"])],
+            t["barons"], YN[bool(t["firstBaron"])],
+            t["heralds"], YN[bool(t["firstHerald"])],
+            t["grubs"], YN[bool(t["firstGrubs"])],
+            t["towers"], YN[bool(t["firstTower"])],
+            YN[bool(t["firstBlood"])],
+        )
+        for team_id, t in team_obj.items()
+    }
+
     for p in participants:
         kills = p.get("kills", 0)
         deaths = p.get("deaths", 0)
@@ -414,7 +281,6 @@ def extract_stats(match_data, solo_kills=None, interval_stats=None,
 
         team_id = p.get("teamId", 100)
         team = "Blue" if team_id == 100 else "Red"
-        t_obj = team_obj.get(team_id, {})
         t_totals = team_totals.get(team_id, {"kills": 0, "damage": 0, "gold": 0})
 
         # Bans for this player's team (padded to 5)
@@ -463,8 +329,8 @@ def extract_stats(match_data, solo_kills=None, interval_stats=None,
             p.get("doubleKills", 0), p.get("tripleKills", 0),
             p.get("quadraKills", 0), p.get("pentaKills", 0),
             p.get("largestMultiKill", 0), p.get("largestKillingSpree", 0),
-            "Yes" if p.get("firstBloodKill") else "No",
-            "Yes" if p.get("firstBloodAssist") else "No",
+            YN[bool(p.get("firstBloodKill"))],
+            YN[bool(p.get("firstBloodAssist"))],
             damage, int(damage_per_min), damage_share,
             p.get("physicalDamageDealtToChampions", 0),
             p.get("magicDamageDealtToChampions", 0),
@@ -507,18 +373,13 @@ def extract_stats(match_data, solo_kills=None, interval_stats=None,
             challenges.get("turretPlatesTaken", ""),
             challenges.get("soloTurretsLategame", ""),
             challenges.get("turretTakedowns", ""),
-            "Yes" if p.get("gameEndedInSurrender") else "No",
-            "Yes" if p.get("gameEndedInEarlySurrender") else "No",
+            YN[bool(p.get("gameEndedInSurrender"))],
+            YN[bool(p.get("gameEndedInEarlySurrender"))],
             p.get("allInPings", 0), p.get("assistMePings", 0),
             p.get("dangerPings", 0), p.get("enemyMissingPings", 0),
             p.get("enemyVisionPings", 0), p.get("onMyWayPings", 0),
             p.get("pushPings", 0), p.get("needVisionPings", 0),
-            t_obj.get("dragons", 0), "Yes" if t_obj.get("firstDragon") else "No",
-            t_obj.get("barons", 0), "Yes" if t_obj.get("firstBaron") else "No",
-            t_obj.get("heralds", 0), "Yes" if t_obj.get("firstHerald") else "No",
-            t_obj.get("grubs", 0), "Yes" if t_obj.get("firstGrubs") else "No",
-            t_obj.get("towers", 0), "Yes" if t_obj.get("firstTower") else "No",
-            "Yes" if t_obj.get("firstBlood") else "No",
+            *team_cells.get(team_id, EMPTY_TEAM_CELLS),
             "Win" if p.get("win") else "Loss",
             "", "",  # Season, Season Phase (fill manually)
             LEAGUE_NAME,  # League
@@ -529,69 +390,6 @@ def extract_stats(match_data, solo_kills=None, interval_stats=None,
     return rows
 
 
-# ============================================================
-# GOOGLE SHEETS
-# ============================================================
-
-def connect_to_sheet():
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = Credentials.from_service_account_file(GOOGLE_CREDENTIALS_FILE, scopes=scopes)
-    gc = gspread.authorize(creds)
-    try:
-        spreadsheet = gc.open(SPREADSHEET_NAME)
-    except gspread.SpreadsheetNotFound:
-        print(f"[ERROR] Spreadsheet '{SPREADSHEET_NAME}' not found.")
-        sys.exit(1)
-    try:
-        worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-    except gspread.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=WORKSHEET_NAME, rows=1000, cols=200)
-    return worksheet
-
-
-def write_to_sheet(worksheet, all_rows):
-    try:
-        first_row = worksheet.row_values(1)
-    except Exception:
-        first_row = []
-
-    if not first_row or first_row[0] != STAT_HEADERS[0]:
-        worksheet.update('A1', [STAT_HEADERS])
-        print(f"  Added headers to '{WORKSHEET_NAME}'")
-
-    if all_rows:
-        existing = worksheet.get_all_values()
-        existing_keys = set()
-        match_id_col = STAT_HEADERS.index("Match ID")
-        name_col = STAT_HEADERS.index("Summoner Name")
-        for row in existing[1:]:
-            if len(row) > max(match_id_col, name_col):
-                existing_keys.add(f"{row[match_id_col]}_{row[name_col]}")
-
-        new_rows = []
-        dupes = 0
-        for row in all_rows:
-            key = f"{row[match_id_col]}_{row[name_col]}"
-            if key in existing_keys:
-                dupes += 1
-            else:
-                new_rows.append(row)
-
-        if dupes:
-            print(f"  Skipped {dupes} duplicate rows already in sheet")
-        if new_rows:
-            next_row = len(existing) + 1
-            worksheet.update(f'A{next_row}', new_rows)
-            print(f"  Wrote {len(new_rows)} new rows to '{WORKSHEET_NAME}'")
-        else:
-            print("  No new data to write.")
-    else:
-        print("  No data to write.")
-
-
 # ============================================================
 # MATCH IDS
 # ============================================================
@@ -606,9 +404,22 @@ MATCH_IDS = [
 # HELPER
 # ============================================================
 
-def fetch_and_extract(match_id, match_data):
-    print(f"  Fetching timeline data...")
-    timeline_data = get_match_timeline(match_id)
+async def fetch_details_and_timelines(match_ids, keep=None):
+    """
+    Fetch match details for every ID concurrently, then timelines for the ones
+    that came back (and pass `keep`, if given). Returns [(match_id, match_data, timeline_data)].
+    """
+    limiter = Backpressure()
+    with open_cache() as db:
+        async with make_async_client() as client:
+            details = await asyncio.gather(*[get_match_details(client, limiter, db, mid) for mid in match_ids])
+            found = [(mid, md) for mid, md in zip(match_ids, details) if md and (keep is None or keep(md))]
+            print(f"  Fetching {len(found)} timeline(s)...")
+            timelines = await asyncio.gather(*[get_match_timeline(client, limiter, db, mid) for mid, _ in found])
+    return [(mid, md, tl) for (mid, md), tl in zip(found, timelines)]
+
+
+def extract_with_timeline(match_data, timeline_data):
     solo_kills, interval_stats, turret_plates, first_blood_info, level6_timestamps = parse_timeline_data(timeline_data)
 
     total_solos = sum(solo_kills.values())
@@ -635,7 +446,7 @@ def fetch_and_extract(match_id, match_data):
 # MAIN
 # ============================================================
 
-def main():
+async def main():
     global CHAMPION_ID_MAP
 
     if not RIOT_API_KEY or RIOT_API_KEY == "your-riot-api-key-here":
@@ -644,13 +455,14 @@ def main():
     if not os.path.exists(GOOGLE_CREDENTIALS_FILE):
         print(f"[ERROR] Google credentials file not found: {GOOGLE_CREDENTIALS_FILE}")
         return
+    set_api_key(RIOT_API_KEY)
 
     # Load champion ID map for resolving ban championIds to names
     print("Loading champion ID mappings from Data Dragon...")
     CHAMPION_ID_MAP = fetch_champion_id_map()
     print()
 
-    print(f"Total columns per row: {len(STAT_HEADERS)}")
+    print(f"Total columns per row: {len(STAT_HEADERS['inhouse'])}")
     print()
 
     if MATCH_IDS:
@@ -658,24 +470,21 @@ def main():
         print(f"{'='*60}\n")
 
         all_rows = []
-        for i, match_id in enumerate(MATCH_IDS, 1):
-            print(f"[{i}/{len(MATCH_IDS)}] Fetching: {match_id}")
-            match_data = get_match_details(match_id)
-            time.sleep(API_DELAY)
-            if not match_data:
-                continue
+        all_rows_extend = all_rows.extend
+        fetched = await fetch_details_and_timelines(MATCH_IDS)
+        for i, (match_id, match_data, timeline_data) in enumerate(fetched, 1):
+            print(f"[{i}/{len(fetched)}] {match_id}")
 
             info = match_data.get("info", {})
             duration = round(info.get("gameDuration", 0) / 60, 1)
-            tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
             game_start_ts = info.get("gameStartTimestamp", 0) / 1000
-            game_date = datetime.fromtimestamp(game_start_ts, tz=tz).strftime("%Y-%m-%d %I:%M %p")
+            game_date = datetime.fromtimestamp(game_start_ts, tz=TZ).strftime("%Y-%m-%d %I:%M %p")
             players = len(info.get("participants", []))
 
             print(f"  Date: {game_date} | Duration: {duration}m | Players: {players}")
 
-            stats = fetch_and_extract(match_id, match_data)
-            all_rows.extend(stats)
+            stats = extract_with_timeline(match_data, timeline_data)
+            all_rows_extend(stats)
             print(f"  ✓ Extracted {len(stats)} player rows\n")
 
         print(f"{'='*60}")
@@ -683,8 +492,8 @@ def main():
 
         if all_rows:
             print(f"\nConnecting to Google Sheets...")
-            worksheet = connect_to_sheet()
-            write_to_sheet(worksheet, all_rows)
+            worksheet = connect_to_sheet(GOOGLE_CREDENTIALS_FILE, SPREADSHEET_NAME, WORKSHEET_NAME, cols=200)
+            write_to_sheet(worksheet, all_rows, mode="inhouse")
             print("\nDone! Check your spreadsheet.")
         return
 
@@ -693,46 +502,54 @@ def main():
         print("[ERROR] No player Riot IDs provided!")
         return
 
-    windows = get_game_time_windows(GAME_DAY)
-    tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
+    windows = get_game_time_windows(GAME_DAY, TARGET_DATES)
+    starts, ends = split_windows(windows)
     earliest_timestamp = windows[0][0]
+    latest_timestamp = windows[-1][1]
     all_match_ids = set()
+    history_queues = get_history_queues(CUSTOM_QUEUE_IDS, FILTER_QUEUES_SERVER_SIDE)
     all_rows = []
+    all_rows_extend = all_rows.extend
 
     for i, riot_id in enumerate(PLAYER_RIOT_IDS, 1):
         print(f"[{i}/{len(PLAYER_RIOT_IDS)}] Looking up: {riot_id}")
         puuid = get_puuid_from_riot_id(riot_id)
-        time.sleep(API_DELAY)
         if not puuid:
             continue
-        match_ids = get_all_match_ids(puuid, earliest_timestamp)
+        match_ids = []
+        for queue in history_queues:
+            match_ids += get_all_match_ids(puuid, earliest_timestamp, latest_timestamp, queue)
         if match_ids:
-            new_ids = set(match_ids) - all_match_ids
+            before = len(all_match_ids)
             all_match_ids.update(match_ids)
-            print(f"  {len(new_ids)} new unique matches")
+            print(f"  {len(all_match_ids) - before} new unique matches")
         print()
 
-    custom_count = 0
-    for i, match_id in enumerate(sorted(all_match_ids), 1):
-        print(f"[{i}/{len(all_match_ids)}] Fetching: {match_id}")
-        match_data = get_match_details(match_id)
-        time.sleep(API_DELAY)
-        if not match_data:
-            continue
-        if is_inhouse_game(match_data, windows):
-            custom_count += 1
-            stats = fetch_and_extract(match_id, match_data)
-            all_rows.extend(stats)
-            print(f"  ✓ Inhouse game! {len(stats)} players")
+    match_id_prefix = f"{PLATFORM}_"
+    wrong_shard = {m for m in all_match_ids if not m.startswith(match_id_prefix)}
+    all_match_ids -= wrong_shard
+    if wrong_shard:
+        print(f"Skipped {len(wrong_shard)} match(es) from other shards")
+
+    print(f"Fetching {len(all_match_ids)} match(es) concurrently...")
+    inhouse = await fetch_details_and_timelines(
+        sorted(all_match_ids), keep=lambda md: is_inhouse_game(md, starts, ends, CUSTOM_QUEUE_IDS),
+    )
+    custom_count = len(inhouse)
+    for match_id, match_data, timeline_data in inhouse:
+        print(f"{match_id}")
+        stats = extract_with_timeline(match_data, timeline_data)
+        all_rows_extend(stats)
+        print(f"  ✓ Inhouse game! {len(stats)} players")
 
     print(f"\nInhouse games found: {custom_count}")
     print(f"Total rows: {len(all_rows)}")
 
     if all_rows:
-        worksheet = connect_to_sheet()
-        write_to_sheet(worksheet, all_rows)
+        worksheet = connect_to_sheet(GOOGLE_CREDENTIALS_FILE, SPREADSHEET_NAME, WORKSHEET_NAME, cols=200)
+        write_to_sheet(worksheet, all_rows, mode="inhouse")
         print("\nDone!")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,691 @@
+"""
+Riot Stats Core
+===============
+Shared plumbing for riot_tournament_stats.py and ember_stats.py: the Riot HTTP
+session, rate limiting and retries, the local match cache, game night date
+windows and Google Sheets output. Each script keeps its own config, row
+building and main loop, and imports the rest from here.
+
+Region, timezone and rate limit settings below apply to both scripts.
+"""
+
+import asyncio
+import bisect
+import functools
+import shelve
+import httpx
+import orjson
+import gspread
+import sys
+import time
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from itertools import zip_longest
+from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+# Riot API region for match lookups
+# Options: "americas", "europe", "asia", "sea"
+REGION = "americas"
+
+# Platform shard your players are on. Match IDs are prefixed with it
+# (e.g. "NA1_4567890123"), so anything else is skipped without a lookup.
+PLATFORM = "NA1"
+
+# Timezone offset from UTC for game time (EST = -5, CST = -6, PST = -8)
+GAME_TIMEZONE_OFFSET = -5  # EST
+TZ = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
+
+# Rate limiting - adaptive concurrency for match detail requests.
+# Starts at CONCURRENCY_START in flight, grows by 0.5 per clean response
+# and halves on every 429/5xx, staying within MIN..MAX.
+# Dev key: max 20 is safe | Production key: can go higher
+CONCURRENCY_START = 4
+CONCURRENCY_MIN = 1
+CONCURRENCY_MAX = 20
+
+# Retry policy for rate-limited / failed requests
+MAX_RETRIES = 6
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Without a Retry-After header, wait min(CAP, 2^attempt) seconds plus up to JITTER
+RETRY_BACKOFF_CAP = 60
+RETRY_JITTER = 0.5
+
+# Pause before sending once this fraction of any Riot rate limit window is used
+RATE_LIMIT_THRESHOLD = 0.9
+
+# Riot's per-method limits as (requests, per seconds). Each route gets its own
+# token bucket so a busy route can't eat into a quiet one's budget.
+ROUTE_RATE_LIMITS = {
+    "account-v1": (1000, 60),
+    "match-v5/ids": (2000, 10),
+    "match-v5/by-id": (2000, 10),
+    "match-v5/timeline": (2000, 10),
+}
+
+# Local cache of raw match/timeline JSON keyed by match ID, reused across runs.
+# Match data never changes once a game ends, so entries never expire.
+# Delete the .match_cache* files to force a refetch.
+MATCH_CACHE_FILE = ".match_cache"
+
+# Re-check cached entries that came with an ETag using If-None-Match. Riot answers
+# 304 with no body when nothing changed, so the cached copy is reused without
+# downloading or parsing it again. Each check still uses a request from the rate
+# limit. Set to False to trust the cache outright.
+CACHE_REVALIDATE = True
+
+# ============================================================
+# RIOT API FUNCTIONS
+# ============================================================
+
+# One keep-alive HTTP/2 connection for every call to {REGION}.api.riotgames.com.
+# HPACK compresses the X-Riot-Token header that goes out on every request.
+SESSION = httpx.Client(
+    http2=True,
+    headers={"X-Riot-Token": ""},  # filled in by set_api_key()
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+)
+
+
+def set_api_key(api_key):
+    """Point SESSION (and every async client made after this) at `api_key`."""
+    SESSION.headers["X-Riot-Token"] = api_key
+
+
+def parse_riot_headers(headers):
+    """
+    Yield (window_seconds, used, limit) for each of Riot's app rate limit windows.
+    Riot sends e.g. X-App-Rate-Limit: "20:1,100:120" (limit:window)
+    and X-App-Rate-Limit-Count: "3:1,41:120" (used:window).
+    """
+    limits = headers.get("X-App-Rate-Limit")
+    counts = headers.get("X-App-Rate-Limit-Count")
+    if not limits or not counts:
+        return
+    limit_by_window = {}
+    for part in limits.split(","):
+        limit, window = part.split(":")
+        limit_by_window[int(window)] = int(limit)
+    for part in counts.split(","):
+        used, window = part.split(":")
+        window = int(window)
+        if window in limit_by_window:
+            yield window, int(used), limit_by_window[window]
+
+
+class RateLimitTracker:
+    """
+    Client-side copy of Riot's app rate limit windows, kept current from response
+    headers, so callers can pause before a window runs out instead of eating a 429.
+    """
+
+    def __init__(self, threshold=RATE_LIMIT_THRESHOLD):
+        self.threshold = threshold
+        self.buckets = {}  # window seconds -> [used, limit, window start (monotonic)]
+
+    def reserve(self):
+        """Count a request we're about to send against every known window."""
+        now = time.monotonic()
+        for window, bucket in self.buckets.items():
+            if now >= bucket[2] + window:
+                bucket[0], bucket[2] = 0, now
+            bucket[0] += 1
+
+    def update_buckets(self, resp):
+        now = time.monotonic()
+        for window, used, limit in parse_riot_headers(resp.headers):
+            bucket = self.buckets.get(window)
+            if bucket is None or now >= bucket[2] + window:
+                self.buckets[window] = [used, limit, now]
+            else:
+                # Responses can land out of order, so never let the count go backwards
+                bucket[0], bucket[1] = max(bucket[0], used), limit
+
+    def wait_time(self):
+        """Seconds to hold off before the next request (0 if there's headroom)."""
+        now = time.monotonic()
+        wait = 0.0
+        for window, (used, limit, start) in self.buckets.items():
+            reset_at = start + window
+            if used >= limit * self.threshold and reset_at > now:
+                wait = max(wait, reset_at - now)
+        return wait
+
+
+RATE_LIMITS = RateLimitTracker()
+
+
+class TokenBucket:
+    """Refills at `rate` tokens/second up to `burst`; every request on the route takes one."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+
+    def reserve(self):
+        """
+        Take a token and return how long to wait before using it (0 if one was free).
+        Tokens can go negative, so concurrent callers queue up behind each other.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+BUCKETS = {route: TokenBucket(n / per, n) for route, (n, per) in ROUTE_RATE_LIMITS.items()}
+
+ROUTE_PATTERNS = (
+    ("account-v1", re.compile(r"/riot/account/v1/")),
+    ("match-v5/ids", re.compile(r"/lol/match/v5/matches/by-puuid/[^/]+/ids$")),
+    ("match-v5/timeline", re.compile(r"/lol/match/v5/matches/[^/]+/timeline$")),
+    ("match-v5/by-id", re.compile(r"/lol/match/v5/matches/[^/]+$")),
+)
+
+
+def route_bucket(url):
+    """The token bucket for the Riot route `url` hits, or None if it isn't rate limited per route."""
+    for route, pattern in ROUTE_PATTERNS:
+        if pattern.search(url):
+            return BUCKETS.get(route)
+    return None
+
+
+def pacing_delay(bucket):
+    """Seconds to hold off before a request: the app window or the route bucket, whichever is longer."""
+    route_wait = bucket.reserve() if bucket else 0.0
+    return max(RATE_LIMITS.wait_time(), route_wait)
+
+
+def retry_delay(attempt, retry_after=None):
+    """
+    Seconds to wait before retry number `attempt` (0-based): Riot's Retry-After if it
+    sent one, else capped exponential backoff. Jittered either way so retries spread out.
+    """
+    base = float(retry_after) if retry_after else min(RETRY_BACKOFF_CAP, 1 << attempt)
+    return base + random.uniform(0, RETRY_JITTER)
+
+
+def resp_json(resp):
+    """Parse a response body with orjson — much faster than resp.json() on large match payloads."""
+    return orjson.loads(resp.content)
+
+
+def riot_get(url, params=None):
+    """SESSION.get that paces itself off Riot's rate limit headers and retries 429/5xx/dropped connections."""
+    bucket = route_bucket(url)
+    for attempt in range(MAX_RETRIES):
+        wait = pacing_delay(bucket)
+        if wait:
+            print(f"    Near rate limit, pausing {wait:.1f}s")
+            time.sleep(wait)
+        RATE_LIMITS.reserve()
+        try:
+            resp = SESSION.get(url, params=params)
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            delay = retry_delay(attempt)
+            print(f"    [WARN] {type(e).__name__}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        RATE_LIMITS.update_buckets(resp)
+
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES - 1:
+            break
+        delay = retry_delay(attempt, resp.headers.get("Retry-After"))
+        print(f"    [WARN] {resp.status_code} from Riot API, retrying in {delay:.1f}s")
+        time.sleep(delay)
+    return resp
+
+
+def get_game_time_windows(day_of_week, target_dates=()):
+    """
+    Get start and end timestamps for every date in `target_dates` ("YYYY-MM-DD"),
+    or for the most recent `day_of_week` (0=Monday) if none are given.
+    """
+    windows = []
+
+    if target_dates:
+        for date_str in target_dates:
+            target_day = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=TZ)
+            start = target_day.replace(hour=12, minute=0, second=0, microsecond=0)
+            end = (target_day + timedelta(days=1)).replace(hour=5, minute=0, second=0, microsecond=0)
+            windows.append((int(start.timestamp()), int(end.timestamp())))
+    else:
+        today = datetime.now(TZ)
+        days_since = (today.weekday() - day_of_week) % 7
+        if days_since == 0 and today.hour < 12:
+            days_since = 7
+        target_day = today - timedelta(days=days_since)
+        start = target_day.replace(hour=12, minute=0, second=0, microsecond=0)
+        end = (target_day + timedelta(days=1)).replace(hour=5, minute=0, second=0, microsecond=0)
+        windows.append((int(start.timestamp()), int(end.timestamp())))
+
+    # Sort windows by start time (earliest first)
+    windows.sort(key=lambda w: w[0])
+    return windows
+
+
+def split_windows(windows):
+    """Split sorted (start, end) windows into parallel start/end lists for bisect lookups."""
+    return [start for start, _ in windows], [end for _, end in windows]
+
+
+@functools.lru_cache(maxsize=512)
+def get_puuid_from_riot_id(riot_id):
+    """Convert a Riot ID (Name#Tag) to a PUUID."""
+    parts = riot_id.split("#")
+    if len(parts) != 2:
+        print(f"  [ERROR] Invalid Riot ID format: '{riot_id}' — should be Name#Tag")
+        return None
+
+    game_name, tag_line = parts
+    url = (
+        f"https://{REGION}.api.riotgames.com"
+        f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
+    )
+    resp = riot_get(url)
+
+    if resp.status_code == 200:
+        return resp_json(resp).get("puuid")
+    else:
+        print(f"  [ERROR] Failed to look up '{riot_id}': {resp.status_code} - {resp.text}")
+        return None
+
+
+def get_history_queues(queue_ids, filter_server_side=True):
+    """Queue IDs to page match history for ([None] means all queues)."""
+    if not filter_server_side:
+        return [None]
+    return sorted(set(queue_ids) | {0})
+
+
+def get_all_match_ids(puuid, start_time, end_time, queue=None):
+    """
+    Page through a player's match history between two epoch-second timestamps.
+    Riot filters by startTime/endTime (and queue, if given) server-side,
+    so every page is already in range.
+    """
+    all_ids = []
+    start_index = 0
+    batch_size = 100
+
+    while True:
+        url = (
+            f"https://{REGION}.api.riotgames.com"
+            f"/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        )
+        params = {
+            "start": start_index,
+            "count": batch_size,
+            "startTime": start_time,
+            "endTime": end_time,
+        }
+        if queue is not None:
+            params["queue"] = queue
+        resp = riot_get(url, params=params)
+
+        if resp.status_code != 200:
+            print(f"    [ERROR] Failed to get matches (start={start_index}): {resp.status_code} - {resp.text}")
+            break
+
+        batch = resp_json(resp)
+        if batch:
+            all_ids.extend(batch)
+            print(f"    Fetched {len(batch)} matches (total: {len(all_ids)}, index {start_index}-{start_index + len(batch) - 1})")
+
+        if len(batch) < batch_size:
+            print("    ✓ No more matches in the date range")
+            break
+
+        start_index += batch_size
+
+    return all_ids
+
+
+def make_async_client():
+    """Create the HTTP/2 client used for concurrent match detail fetches."""
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"X-Riot-Token": SESSION.headers["X-Riot-Token"]},
+        limits=httpx.Limits(max_connections=10),
+        timeout=httpx.Timeout(10.0),
+    )
+
+
+class Backpressure:
+    """
+    AIMD concurrency limit for the async Riot calls.
+    Every clean response lets 0.5 more requests fly; a burst of 429/5xx/connection
+    resets halves the limit once, and each failed request backs off on its own
+    retry count, so throughput settles just under whatever the API will currently take.
+    """
+
+    def __init__(self, c=CONCURRENCY_START, c_min=CONCURRENCY_MIN, c_max=CONCURRENCY_MAX):
+        self.c = c
+        self.c_min = c_min
+        self.c_max = c_max
+        self.in_flight = 0
+        self.epoch = 0  # bumped on every cut, so one congestion event only halves once
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.c))
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        self.c = min(self.c_max, self.c + 0.5)
+
+    async def on_error(self, attempt, sent_epoch, retry_after=None):
+        """
+        Back off before the request's retry number `attempt` (0-based). Only a request
+        sent since the last cut halves the limit; ones already in flight then just wait.
+        """
+        if sent_epoch == self.epoch:
+            self.epoch += 1
+            self.c = max(self.c_min, self.c * 0.5)
+        await asyncio.sleep(retry_delay(attempt, retry_after))
+
+
+async def riot_get_async(client, limiter, url, headers=None):
+    """GET a Riot API URL under the AIMD limiter, retrying 429/5xx and connection resets."""
+    bucket = route_bucket(url)
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            async with limiter:
+                wait = pacing_delay(bucket)
+                if wait:
+                    await asyncio.sleep(wait)
+                RATE_LIMITS.reserve()
+                sent_epoch = limiter.epoch
+                resp = await client.get(url, headers=headers)
+            RATE_LIMITS.update_buckets(resp)
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            print(f"  [WARN] {type(e).__name__} on {url}, backing off (limit {int(limiter.c)})")
+            await limiter.on_error(attempt - 1, sent_epoch)
+            continue
+
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        retry_after = resp.headers.get("Retry-After")
+        print(f"  [WARN] {resp.status_code} from Riot API, backing off (limit {int(limiter.c)})")
+        await limiter.on_error(attempt - 1, sent_epoch, retry_after)
+
+    if resp.status_code not in RETRY_STATUSES:
+        limiter.on_success()
+    return resp
+
+
+def open_cache():
+    """
+    Open the match cache for a whole run. Open it once and pass it around: dbm.dumb
+    (Windows, Pythons without gdbm) rereads and rewrites its whole index on every
+    open/close, so opening per key gets slower as the cache grows.
+    """
+    return shelve.open(MATCH_CACHE_FILE)
+
+
+def cache_get(db, key):
+    """Return (etag, raw JSON) cached for `key`, or (None, None) if we've never fetched it."""
+    entry = db.get(key)
+    if entry is None:
+        return None, None
+    if isinstance(entry, (bytes, str)):
+        # Written before entries carried an ETag (older runs stored bytes or text)
+        return None, entry
+    return entry
+
+
+def cache_put(db, key, etag, raw_json):
+    db[key] = (etag, raw_json)
+
+
+async def riot_get_cached(client, limiter, db, url, key):
+    """
+    GET a Riot API URL through the open match cache `db`, stored under `key`.
+    Returns (data, None) on success, or (None, resp) if Riot sent back an error.
+    """
+    etag, raw = cache_get(db, key)
+    if raw is not None and not (etag and CACHE_REVALIDATE):
+        return orjson.loads(raw), None
+
+    headers = {"If-None-Match": etag} if raw is not None else None
+    resp = await riot_get_async(client, limiter, url, headers=headers)
+
+    if resp.status_code == 304:
+        return orjson.loads(raw), None
+    if resp.status_code == 200:
+        cache_put(db, key, resp.headers.get("ETag"), resp.content)
+        return resp_json(resp), None
+    return None, resp
+
+
+async def get_match_details(client, limiter, db, match_id):
+    """Get full match details by match ID, through the open match cache `db`."""
+    url = (
+        f"https://{REGION}.api.riotgames.com"
+        f"/lol/match/v5/matches/{match_id}"
+    )
+    data, resp = await riot_get_cached(client, limiter, db, url, match_id)
+
+    if resp is not None:
+        print(f"  [ERROR] Failed to get match details for '{match_id}': {resp.status_code} - {resp.text}")
+    return data
+
+
+async def fetch_match_details(match_ids):
+    """Fetch details for every match ID concurrently. Results line up with `match_ids` (None if a fetch failed)."""
+    limiter = Backpressure()
+    # Cache reads/writes are synchronous and never straddle an await, so every
+    # coroutine can share one handle
+    with open_cache() as db:
+        async with make_async_client() as client:
+            return await asyncio.gather(*[get_match_details(client, limiter, db, mid) for mid in match_ids])
+
+
+def is_custom_game(info, queue_ids):
+    """Check if a match's info block is a custom/tournament game."""
+    return info.get("queueId", -1) in queue_ids or info.get("gameType", "") == "CUSTOM_GAME"
+
+
+def is_inhouse_game(match_data, starts, ends, queue_ids):
+    """Check if a match is a custom/tournament game AND within any of our date windows."""
+    info = match_data.get("info", {})
+    if not is_custom_game(info, queue_ids):
+        return False
+
+    # Windows are sorted and all the same length, so only the last one
+    # starting at or before the game can contain it
+    game_start = info.get("gameStartTimestamp", 0) / 1000
+    i = bisect.bisect_right(starts, game_start) - 1
+    return i >= 0 and game_start <= ends[i]
+
+
+# ============================================================
+# SHEET LAYOUT
+# ============================================================
+
+YN = ("No", "Yes")  # index with bool(flag)
+
+# riot_tournament_stats.py
+TOURNAMENT_HEADERS = [
+    "Date", "Match ID", "Game Duration (min)",
+    "Team", "Summoner Name", "Tag", "Champion", "Role",
+    "Kills", "Deaths", "Assists", "KDA",
+    "Double Kills", "Triple Kills", "Quadra Kills", "Penta Kills",
+    "Total Damage to Champions", "Damage/min", "Physical Damage", "Magic Damage",
+    "True Damage", "Damage Taken", "Damage Mitigated",
+    "CS", "CS/min", "Gold Earned", "Gold/min",
+    "Vision Score", "Wards Placed", "Wards Killed", "Control Wards Bought",
+    "Turret Kills", "Turret Damage", "Objective Damage",
+    "Team Dragons", "Team First Dragon", "Team Barons", "Team First Baron",
+    "Team Heralds", "Team First Herald", "Team Grubs", "Team First Grubs",
+    "Team Towers", "Team First Tower", "Team First Blood",
+    "Win",
+]
+
+# ember_stats.py
+INHOUSE_HEADERS = [
+    "Date", "Match ID", "Game Duration (min)",
+    "Team", "Teams", "Summoner Name", "Tag", "Champion", "Role", "Champion Level",
+    "Kills", "Deaths", "Assists", "KDA", "Solo Kills", "Kill Participation %",
+    "Double Kills", "Triple Kills", "Quadra Kills", "Penta Kills",
+    "Largest Multi Kill", "Largest Killing Spree",
+    "First Blood Kill", "First Blood Assist",
+    "Total Damage to Champions", "Damage/min", "Damage Share %",
+    "Physical Damage", "Magic Damage", "True Damage",
+    "Largest Critical Strike", "Damage Per Gold",
+    "Damage Taken", "Damage Taken/min", "Damage Mitigated",
+    "Total Healing", "Healing on Teammates", "Shielding on Teammates",
+    "Time CCing Others (s)", "Total CC Dealt (s)",
+    "Gold Earned", "Gold/min", "Gold Share %",
+    "Gold Spent", "Consumables Purchased", "Items Purchased",
+    "CS", "CS/min", "Lane Minions Killed", "Neutral Minions Killed",
+    "CS@5", "CS@10", "CS@15", "CS@20",
+    "Gold@5", "Gold@10", "Gold@15", "Gold@20",
+    "XP@5", "XP@10", "XP@15", "XP@20",
+    "Turret Plates Destroyed", "Level 6 Timing (min)",
+    "Vision Score", "Vision Score/min",
+    "Wards Placed", "Wards Killed", "Control Wards Bought",
+    "Detector Wards Placed", "Stealth Wards Placed",
+    "Turret Kills", "Turret Damage", "Objective Damage",
+    "Inhibitor Kills", "Nexus Kills",
+    "Objectives Stolen", "Objectives Stolen Assists",
+    "Baron Kills", "Dragon Kills",
+    "Spell1 Casts (Q)", "Spell2 Casts (W)", "Spell3 Casts (E)", "Spell4 Casts (R)",
+    "Summoner1 Casts", "Summoner2 Casts",
+    "Longest Time Alive (s)", "Total Time Dead (s)",
+    "Lane Minions First 10 Min", "Jungle CS Before 10 Min",
+    "Max CS Advantage on Lane Opponent", "Max Level Lead on Lane Opponent",
+    "Skillshots Hit", "Skillshots Dodged",
+    "Damage Per Minute (challenges)", "Team Damage %",
+    "KDA (challenges)", "Kill Participation (challenges)",
+    "Effective Heal and Shield", "Bounty Gold",
+    "Vision Score Advantage Over Lane Opponent",
+    "Control Wards Placed (challenges)", "Wards Guarded",
+    "First Turret Killed", "First Turret Killed Assist",
+    "Turret Plates Taken (challenges)", "Solo Turrets Late Game", "Turret Takedowns",
+    "Game Ended In Surrender", "Game Ended In Early Surrender",
+    "All In Pings", "Assist Me Pings", "Danger Pings",
+    "Enemy Missing Pings", "Enemy Vision Pings",
+    "On My Way Pings", "Push Pings", "Need Vision Pings",
+    "Team Dragons", "Team First Dragon", "Team Barons", "Team First Baron",
+    "Team Heralds", "Team First Herald", "Team Grubs", "Team First Grubs",
+    "Team Towers", "Team First Tower", "Team First Blood",
+    "Win",
+    "Season", "Season Phase", "League",
+    # ── Bans (same for all 5 players on that team in that match) ──
+    "Ban 1", "Ban 2", "Ban 3", "Ban 4", "Ban 5",
+]
+
+# Sheet layout per script, picked with mode="tournament" or mode="inhouse"
+STAT_HEADERS = {
+    "tournament": TOURNAMENT_HEADERS,
+    "inhouse": INHOUSE_HEADERS,
+}
+
+
+# ============================================================
+# GOOGLE SHEETS
+# ============================================================
+
+
+def connect_to_sheet(credentials_file, spreadsheet_name, worksheet_name, cols=60):
+    """Connect to Google Sheets and return the worksheet, creating the tab if it's missing."""
+    scopes = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive",
+    ]
+    creds = Credentials.from_service_account_file(credentials_file, scopes=scopes)
+    gc = gspread.authorize(creds)
+
+    try:
+        spreadsheet = gc.open(spreadsheet_name)
+    except gspread.SpreadsheetNotFound:
+        print(f"[ERROR] Spreadsheet '{spreadsheet_name}' not found.")
+        print("Make sure you've shared the sheet with your service account email.")
+        sys.exit(1)
+
+    try:
+        worksheet = spreadsheet.worksheet(worksheet_name)
+    except gspread.WorksheetNotFound:
+        worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=1000, cols=cols)
+
+    return worksheet
+
+
+def column_letter(col_index):
+    """A1 column letter for a 0-based column index (0 -> "A", 26 -> "AA")."""
+    return gspread.utils.rowcol_to_a1(1, col_index + 1)[:-1]
+
+
+def write_to_sheet(worksheet, all_rows, mode="tournament"):
+    """
+    Write headers (if missing) + data rows to the worksheet in one batch update.
+    In "inhouse" mode, rows whose Match ID + Summoner Name are already on the
+    sheet are skipped, since each league's run can pick up the same games.
+    """
+    headers = STAT_HEADERS[mode]
+    dedupe = mode == "inhouse"
+    match_id_col = headers.index("Match ID")
+    name_col = headers.index("Summoner Name")
+
+    # One read: column A, plus the two de-dup key columns if we need them.
+    # Not wrapped on purpose: the read decides where new rows start, so if it
+    # fails we stop here rather than write over rows we couldn't see.
+    ranges = ["A:A"]
+    if dedupe:
+        id_letter, name_letter = column_letter(match_id_col), column_letter(name_col)
+        ranges += [f"{id_letter}2:{id_letter}", f"{name_letter}2:{name_letter}"]
+    first_col, *existing = worksheet.batch_get(ranges)
+
+    data = []
+    if not first_col or not first_col[0] or first_col[0][0] != headers[0]:
+        data.append({"range": absolute_range_name(worksheet.title, "A1"), "values": [headers]})
+        print(f"  Adding headers to '{worksheet.title}'")
+
+    new_rows = all_rows
+    if dedupe and all_rows:
+        existing_ids, existing_names = existing
+        existing_keys = set()
+        for id_cell, name_cell in zip_longest(existing_ids, existing_names, fillvalue=[]):
+            if id_cell:
+                existing_keys.add(f"{id_cell[0]}_{name_cell[0] if name_cell else ''}")
+
+        new_rows = [row for row in all_rows if f"{row[match_id_col]}_{row[name_col]}" not in existing_keys]
+        dupes = len(all_rows) - len(new_rows)
+        if dupes:
+            print(f"  Skipped {dupes} duplicate rows already in sheet")
+
+    if new_rows:
+        next_row = max(len(first_col), 1) + 1
+        data.append({"range": absolute_range_name(worksheet.title, f"A{next_row}"), "values": new_rows})
+
+    if data:
+        # Header + rows go out as a single Sheets API call
+        worksheet.spreadsheet.values_batch_update({"valueInputOption": "RAW", "data": data})
+
+    if new_rows:
+        print(f"  Wrote {len(new_rows)} rows to '{worksheet.title}'")
+    elif all_rows:
+        print("  No new data to write.")
+    else:
+        print("  No data to write.")
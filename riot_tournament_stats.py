@@ -5,7 +5,7 @@ Pulls match stats from Riot API using tournament codes
 and writes them to a Google Sheets spreadsheet.
 
 SETUP:
-1. pip install requests gspread google-auth python-dotenv
+1. pip install "httpx[http2]" orjson pandas gspread google-auth python-dotenv
 2. Copy .env.example to .env and fill in your values:
    - RIOT_API_KEY from https://developer.riotgames.com
    - GOOGLE_CREDENTIALS_FILE path to your service account JSON
@@ -19,13 +19,18 @@ SETUP:
 5. Run: python riot_tournament_stats.py
 """
 
-import requests
-import gspread
-import time
-import sys
+import asyncio
+import operator
 import os
+import pandas as pd
+from datetime import datetime
 from dotenv import load_dotenv
-from google.oauth2.service_account import Credentials
+from riot_stats_core import (
+    PLATFORM, TZ, YN, STAT_HEADERS,
+    set_api_key, get_game_time_windows, split_windows, get_puuid_from_riot_id,
+    get_history_queues, get_all_match_ids, fetch_match_details,
+    is_custom_game, is_inhouse_game, connect_to_sheet, write_to_sheet,
+)
 
 # ============================================================
 # LOAD ENV VARIABLES
@@ -41,10 +46,6 @@ SPREADSHEET_NAME = os.getenv("SPREADSHEET_NAME", "Tournament Stats")
 # CONFIG
 # ============================================================
 
-# Riot API region for match lookups
-# Options: "americas", "europe", "asia", "sea"
-REGION = "americas"
-
 # Worksheet tab name
 WORKSHEET_NAME = "Sheet1"
 
@@ -70,341 +71,158 @@ TARGET_DATES = [
     # "2026-02-16",
 ]
 
-# Timezone offset from UTC for game time (EST = -5, CST = -6, PST = -8)
-GAME_TIMEZONE_OFFSET = -5  # EST
-
 # Queue IDs to look for
 # 3130 = Battlefy/tournament custom games
 # 0 = regular custom games
 CUSTOM_QUEUE_IDS = [0, 3130]
 
-# Rate limiting - delay between API calls (seconds)
-# Dev key: 1.2s is safe | Production key: 0.1s is usually fine
-API_DELAY = 1.2
+# Ask Riot for only these queues (plus 0, plain custom games) when paging match
+# history, instead of every ranked/normal game. Set to False if inhouse games
+# seem to be missing.
+FILTER_QUEUES_SERVER_SIDE = True
+
+# Region, timezone and rate limit settings are shared with ember_stats.py
+# and live in riot_stats_core.py
 
 # ============================================================
-# RIOT API FUNCTIONS
+# TEAM OBJECTIVE EXTRACTION
 # ============================================================
 
-HEADERS = {"X-Riot-Token": RIOT_API_KEY}
+# Objectives whose kills + first-take flag become Team X / Team First X column pairs
+OBJECTIVE_KEYS = ("dragon", "baron", "riftHerald", "horde", "tower")
 
+# Objective cells for a team missing from match data
+EMPTY_TEAM_CELLS = (0, "No") * len(OBJECTIVE_KEYS) + ("No",)
 
-def get_game_time_windows(day_of_week):
-    """Get start and end timestamps for all target dates."""
-    tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
-    windows = []
-
-    if TARGET_DATES:
-        for date_str in TARGET_DATES:
-            target_day = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=tz)
-            start = target_day.replace(hour=12, minute=0, second=0, microsecond=0)
-            end = (target_day + timedelta(days=1)).replace(hour=5, minute=0, second=0, microsecond=0)
-            windows.append((int(start.timestamp()), int(end.timestamp())))
-    else:
-        today = datetime.now(tz)
-        days_since = (today.weekday() - day_of_week) % 7
-        if days_since == 0 and today.hour < 12:
-            days_since = 7
-        target_day = today - timedelta(days=days_since)
-        start = target_day.replace(hour=12, minute=0, second=0, microsecond=0)
-        end = (target_day + timedelta(days=1)).replace(hour=5, minute=0, second=0, microsecond=0)
-        windows.append((int(start.timestamp()), int(end.timestamp())))
-
-    # Sort windows by start time (earliest first)
-    windows.sort(key=lambda w: w[0])
-    return windows
-
-
-def get_puuid_from_riot_id(riot_id):
-    """Convert a Riot ID (Name#Tag) to a PUUID."""
-    parts = riot_id.split("#")
-    if len(parts) != 2:
-        print(f"  [ERROR] Invalid Riot ID format: '{riot_id}' — should be Name#Tag")
-        return None
-
-    game_name, tag_line = parts
-    url = (
-        f"https://{REGION}.api.riotgames.com"
-        f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    )
-    resp = requests.get(url, headers=HEADERS)
-
-    if resp.status_code == 200:
-        return resp.json().get("puuid")
-    else:
-        print(f"  [ERROR] Failed to look up '{riot_id}': {resp.status_code} - {resp.text}")
-        return None
 
-
-def get_all_match_ids(puuid, earliest_timestamp):
+def get_team_objective_cells(match_data):
     """
-    Page through a player's match history until we pass the earliest target date.
-    Returns all match IDs from now back to that date.
+    Build each team's objective columns (Team Dragons ... Team First Blood) once per match.
+    Returns a dict keyed by teamId (100=Blue, 200=Red) of ready-to-splat tuples.
     """
-    all_ids = []
-    start_index = 0
-    batch_size = 100
-
-    while True:
-        url = (
-            f"https://{REGION}.api.riotgames.com"
-            f"/lol/match/v5/matches/by-puuid/{puuid}/ids"
-        )
-        params = {
-            "start": start_index,
-            "count": batch_size,
-        }
-        resp = requests.get(url, headers=HEADERS, params=params)
-        time.sleep(API_DELAY)
-
-        if resp.status_code != 200:
-            print(f"    [ERROR] Failed to get matches (start={start_index}): {resp.status_code} - {resp.text}")
-            break
-
-        batch = resp.json()
-        if not batch:
-            print(f"    Reached end of match history")
-            break
-
-        all_ids.extend(batch)
-        print(f"    Fetched {len(batch)} matches (total: {len(all_ids)}, index {start_index}-{start_index + len(batch) - 1})")
-
-        # Check the last match timestamp to see if we've gone back far enough
-        last_match_url = (
-            f"https://{REGION}.api.riotgames.com"
-            f"/lol/match/v5/matches/{batch[-1]}"
-        )
-        last_resp = requests.get(last_match_url, headers=HEADERS)
-        time.sleep(API_DELAY)
-
-        if last_resp.status_code == 200:
-            last_match_data = last_resp.json()
-            last_timestamp = last_match_data.get("info", {}).get("gameStartTimestamp", 0) / 1000
-            tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
-            last_date = datetime.fromtimestamp(last_timestamp, tz=tz).strftime("%m/%d/%Y")
-            earliest_date = datetime.fromtimestamp(earliest_timestamp, tz=tz).strftime("%m/%d/%Y")
-            print(f"    Oldest match in batch: {last_date} (need to reach: {earliest_date})")
-
-            if last_timestamp < earliest_timestamp:
-                print(f"    ✓ Reached target date range")
-                break
-
-        if len(batch) < batch_size:
-            print(f"    Reached end of match history")
-            break
+    team_cells = {}
 
-        start_index += batch_size
-
-    return all_ids
-
-
-def get_match_details(match_id):
-    """Get full match details by match ID."""
-    url = (
-        f"https://{REGION}.api.riotgames.com"
-        f"/lol/match/v5/matches/{match_id}"
-    )
-    resp = requests.get(url, headers=HEADERS)
-
-    if resp.status_code == 200:
-        return resp.json()
-    else:
-        print(f"  [ERROR] Failed to get match details for '{match_id}': {resp.status_code} - {resp.text}")
-        return None
-
-
-def is_inhouse_game(match_data, windows):
-    """Check if a match is a custom/tournament game AND within any of our date windows."""
-    info = match_data.get("info", {})
-    queue_id = info.get("queueId", -1)
-    game_type = info.get("gameType", "")
-
-    is_custom = queue_id in CUSTOM_QUEUE_IDS or game_type == "CUSTOM_GAME"
-    if not is_custom:
-        return False
-
-    game_start = info.get("gameStartTimestamp", 0) / 1000
-    for start_time, end_time in windows:
-        if start_time <= game_start <= end_time:
-            return True
+    for team in match_data.get("info", {}).get("teams", []):
+        objectives = team.get("objectives", {})
+        cells = []
+        for key in OBJECTIVE_KEYS:
+            objective = objectives.get(key, {})
+            cells += (objective.get("kills", 0), YN[bool(objective.get("first"))])
+        cells.append(YN[bool(objectives.get("champion", {}).get("first"))])
+        team_cells[team.get("teamId")] = tuple(cells)
 
-    return False
+    return team_cells
 
 
 # ============================================================
-# TEAM OBJECTIVE EXTRACTION
+# STAT EXTRACTION
 # ============================================================
 
+# Participant fields copied straight into the row, grouped by where they land.
+# PARTICIPANT_DEFAULTS fills in anything Riot leaves out so itemgetter never misses.
+MULTIKILL_KEYS = ("doubleKills", "tripleKills", "quadraKills", "pentaKills")
+DAMAGE_DETAIL_KEYS = (
+    "physicalDamageDealtToChampions", "magicDamageDealtToChampions",
+    "trueDamageDealtToChampions", "totalDamageTaken", "damageSelfMitigated",
+)
+VISION_OBJECTIVE_KEYS = (
+    "visionScore", "wardsPlaced", "wardsKilled", "visionWardsBoughtInGame",
+    "turretKills", "damageDealtToTurrets", "damageDealtToObjectives",
+)
+CORE_KEYS = (
+    "riotIdTagline", "championName", "teamPosition", "teamId", "win",
+    "kills", "deaths", "assists", "totalDamageDealtToChampions",
+    "totalMinionsKilled", "neutralMinionsKilled", "goldEarned",
+)
 
-def get_team_objectives(match_data):
-    """
-    Extract team-level objective stats from match data.
-    Returns a dict keyed by teamId (100=Blue, 200=Red).
-    """
-    teams = match_data.get("info", {}).get("teams", [])
-    team_obj = {}
+PARTICIPANT_DEFAULTS = {
+    **dict.fromkeys(MULTIKILL_KEYS + DAMAGE_DETAIL_KEYS + VISION_OBJECTIVE_KEYS + CORE_KEYS, 0),
+    "riotIdTagline": "", "championName": "Unknown", "teamPosition": "Unknown",
+    "teamId": 100, "win": False,
+}
 
-    for team in teams:
-        team_id = team.get("teamId")
-        objectives = team.get("objectives", {})
+PARTICIPANT_KEYS = PARTICIPANT_DEFAULTS.keys()
 
-        team_obj[team_id] = {
-            "dragons": objectives.get("dragon", {}).get("kills", 0),
-            "firstDragon": objectives.get("dragon", {}).get("first", False),
-            "barons": objectives.get("baron", {}).get("kills", 0),
-            "firstBaron": objectives.get("baron", {}).get("first", False),
-            "heralds": objectives.get("riftHerald", {}).get("kills", 0),
-            "firstHerald": objectives.get("riftHerald", {}).get("first", False),
-            "grubs": objectives.get("horde", {}).get("kills", 0),
-            "firstGrubs": objectives.get("horde", {}).get("first", False),
-            "towers": objectives.get("tower", {}).get("kills", 0),
-            "firstTower": objectives.get("tower", {}).get("first", False),
-            "inhibitors": objectives.get("inhibitor", {}).get("kills", 0),
-            "firstInhibitor": objectives.get("inhibitor", {}).get("first", False),
-            "atakhan": objectives.get("atakhan", {}).get("kills", 0),
-            "firstBlood": objectives.get("champion", {}).get("first", False),
-        }
-
-    return team_obj
+get_core = operator.itemgetter(*CORE_KEYS)
+get_multikills = operator.itemgetter(*MULTIKILL_KEYS)
+get_damage_detail = operator.itemgetter(*DAMAGE_DETAIL_KEYS)
+get_vision_objectives = operator.itemgetter(*VISION_OBJECTIVE_KEYS)
 
 
-# ============================================================
-# STAT EXTRACTION
-# ============================================================
+# Columns worked out across the whole DataFrame in build_stats_frame() instead of per player
+DERIVED_COLUMNS = ("KDA", "Damage/min", "CS/min", "Gold/min")
 
-STAT_HEADERS = [
-    "Date", "Match ID", "Game Duration (min)",
-    "Team", "Summoner Name", "Tag", "Champion", "Role",
-    "Kills", "Deaths", "Assists", "KDA",
-    "Double Kills", "Triple Kills", "Quadra Kills", "Penta Kills",
-    "Total Damage to Champions", "Damage/min", "Physical Damage", "Magic Damage",
-    "True Damage", "Damage Taken", "Damage Mitigated",
-    "CS", "CS/min", "Gold Earned", "Gold/min",
-    "Vision Score", "Wards Placed", "Wards Killed", "Control Wards Bought",
-    "Turret Kills", "Turret Damage", "Objective Damage",
-    "Team Dragons", "Team First Dragon", "Team Barons", "Team First Baron",
-    "Team Heralds", "Team First Herald", "Team Grubs", "Team First Grubs",
-    "Team Towers", "Team First Tower", "Team First Blood",
-    "Win",
-]
+# extract_stats() row layout: the sheet columns minus the derived ones
+RAW_COLUMNS = [h for h in STAT_HEADERS["tournament"] if h not in DERIVED_COLUMNS]
 
 
 def extract_stats(match_data):
-    """Extract player stats from match data into spreadsheet rows."""
-    rows = []
+    """Extract raw player stats from match data, one RAW_COLUMNS tuple per player."""
     info = match_data.get("info", {})
     match_id = match_data.get("metadata", {}).get("matchId", "Unknown")
     game_duration_min = round(info.get("gameDuration", 0) / 60, 1)
 
-    tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
     game_start = info.get("gameStartTimestamp", 0) / 1000
-    game_date = datetime.fromtimestamp(game_start, tz=tz).strftime("%Y-%m-%d %I:%M %p")
+    game_date = datetime.fromtimestamp(game_start, tz=TZ).strftime("%Y-%m-%d %I:%M %p")
 
-    team_obj = get_team_objectives(match_data)
+    team_cells = get_team_objective_cells(match_data)
 
-    for p in info.get("participants", []):
-        kills = p.get("kills", 0)
-        deaths = p.get("deaths", 0)
-        assists = p.get("assists", 0)
-        cs = p.get("totalMinionsKilled", 0) + p.get("neutralMinionsKilled", 0)
-        damage = p.get("totalDamageDealtToChampions", 0)
-        gold = p.get("goldEarned", 0)
+    participants = info.get("participants", [])
+    rows = [None] * len(participants)
 
-        kda = round((kills + assists) / max(deaths, 1), 2)
-        cs_per_min = round(cs / max(game_duration_min, 1), 1)
-        damage_per_min = round(damage / max(game_duration_min, 1), 0)
-        gold_per_min = round(gold / max(game_duration_min, 1), 0)
+    for i, raw in enumerate(participants):
+        # Real match data has every key, so only pay for the defaults merge when one is missing
+        p = raw if PARTICIPANT_KEYS <= raw.keys() else {**PARTICIPANT_DEFAULTS, **raw}
+        (tag, champion, role, team_id, win,
+         kills, deaths, assists, damage, lane_cs, jungle_cs, gold) = get_core(p)
+        cs = lane_cs + jungle_cs
 
-        team_id = p.get("teamId", 100)
-        team = "Blue" if team_id == 100 else "Red"
-        t_obj = team_obj.get(team_id, {})
-
-        row = [
+        rows[i] = (
             game_date, match_id, game_duration_min,
-            team,
+            "Blue" if team_id == 100 else "Red",
             p.get("riotIdGameName", p.get("summonerName", "Unknown")),
-            p.get("riotIdTagline", ""),
-            p.get("championName", "Unknown"),
-            p.get("teamPosition", "Unknown"),
-            kills, deaths, assists, kda,
-            p.get("doubleKills", 0), p.get("tripleKills", 0),
-            p.get("quadraKills", 0), p.get("pentaKills", 0),
-            damage, int(damage_per_min),
-            p.get("physicalDamageDealtToChampions", 0),
-            p.get("magicDamageDealtToChampions", 0),
-            p.get("trueDamageDealtToChampions", 0),
-            p.get("totalDamageTaken", 0),
-            p.get("damageSelfMitigated", 0),
-            cs, cs_per_min, gold, int(gold_per_min),
-            p.get("visionScore", 0), p.get("wardsPlaced", 0),
-            p.get("wardsKilled", 0), p.get("visionWardsBoughtInGame", 0),
-            p.get("turretKills", 0), p.get("damageDealtToTurrets", 0),
-            p.get("damageDealtToObjectives", 0),
-            t_obj.get("dragons", 0),
-            "Yes" if t_obj.get("firstDragon") else "No",
-            t_obj.get("barons", 0),
-            "Yes" if t_obj.get("firstBaron") else "No",
-            t_obj.get("heralds", 0),
-            "Yes" if t_obj.get("firstHerald") else "No",
-            t_obj.get("grubs", 0),
-            "Yes" if t_obj.get("firstGrubs") else "No",
-            t_obj.get("towers", 0),
-            "Yes" if t_obj.get("firstTower") else "No",
-            "Yes" if t_obj.get("firstBlood") else "No",
-            "Win" if p.get("win") else "Loss",
-        ]
-        rows.append(row)
+            tag, champion, role,
+            kills, deaths, assists,
+            *get_multikills(p),
+            damage,
+            *get_damage_detail(p),
+            cs, gold,
+            *get_vision_objectives(p),
+            *team_cells.get(team_id, EMPTY_TEAM_CELLS),
+            win,
+        )
 
     return rows
 
 
-# ============================================================
-# GOOGLE SHEETS
-# ============================================================
-
-
-def connect_to_sheet():
-    """Connect to Google Sheets and return the worksheet."""
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = Credentials.from_service_account_file(GOOGLE_CREDENTIALS_FILE, scopes=scopes)
-    gc = gspread.authorize(creds)
+def round_1(x):
+    """Python's round(x, 1), for Series.map."""
+    return round(float(x), 1)
 
-    try:
-        spreadsheet = gc.open(SPREADSHEET_NAME)
-    except gspread.SpreadsheetNotFound:
-        print(f"[ERROR] Spreadsheet '{SPREADSHEET_NAME}' not found.")
-        print("Make sure you've shared the sheet with your service account email.")
-        sys.exit(1)
 
-    try:
-        worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-    except gspread.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=WORKSHEET_NAME, rows=1000, cols=60)
+def round_2(x):
+    """Python's round(x, 2), for Series.map."""
+    return round(float(x), 2)
 
-    return worksheet
 
+def build_stats_frame(all_rows):
+    """
+    Turn extract_stats() rows into a DataFrame in sheet column order, filling in
+    KDA and the per-minute columns for every player at once.
+    """
+    df = pd.DataFrame.from_records(all_rows, columns=RAW_COLUMNS)
+    minutes = df["Game Duration (min)"].clip(lower=1)
 
-def write_to_sheet(worksheet, all_rows):
-    """Write headers + data rows to the worksheet."""
-    try:
-        first_row = worksheet.row_values(1)
-    except Exception:
-        first_row = []
-
-    if not first_row or first_row[0] != STAT_HEADERS[0]:
-        worksheet.update('A1', [STAT_HEADERS])
-        print(f"  Added headers to '{WORKSHEET_NAME}'")
+    # Series.round(n) scales by 10**n before rounding, which can land ties on the
+    # other side from Python's round(). KDA and CS/min keep round() so values match
+    # rows already on the sheet; rounding to 0 places is the same either way.
+    df["KDA"] = ((df["Kills"] + df["Assists"]) / df["Deaths"].clip(lower=1)).map(round_2)
+    df["Damage/min"] = (df["Total Damage to Champions"] / minutes).round(0).astype(int)
+    df["CS/min"] = (df["CS"] / minutes).map(round_1)
+    df["Gold/min"] = (df["Gold Earned"] / minutes).round(0).astype(int)
+    df["Win"] = df["Win"].map({True: "Win", False: "Loss"})
 
-    if all_rows:
-        existing = worksheet.get_all_values()
-        next_row = len(existing) + 1
-        worksheet.update(f'A{next_row}', all_rows)
-        print(f"  Wrote {len(all_rows)} rows to '{WORKSHEET_NAME}'")
-    else:
-        print("  No data to write.")
+    return df[STAT_HEADERS["tournament"]]
 
 
 # ============================================================
@@ -412,7 +230,7 @@ def write_to_sheet(worksheet, all_rows):
 # ============================================================
 
 
-def main():
+async def main():
     if not RIOT_API_KEY or RIOT_API_KEY == "your-riot-api-key-here":
         print("[ERROR] Riot API key not set.")
         print("Add your key to the .env file: RIOT_API_KEY=your-key-here")
@@ -427,48 +245,63 @@ def main():
         print("[ERROR] No player Riot IDs provided!")
         return
 
+    set_api_key(RIOT_API_KEY)
+
     # Get all time windows
-    windows = get_game_time_windows(GAME_DAY)
-    tz = timezone(timedelta(hours=GAME_TIMEZONE_OFFSET))
+    windows = get_game_time_windows(GAME_DAY, TARGET_DATES)
+    starts, ends = split_windows(windows)
     print(f"Looking for inhouse games in {len(windows)} date window(s):")
     for start_time, end_time in windows:
-        start_str = datetime.fromtimestamp(start_time, tz=tz).strftime("%A %Y-%m-%d %I:%M %p EST")
-        end_str = datetime.fromtimestamp(end_time, tz=tz).strftime("%A %Y-%m-%d %I:%M %p EST")
+        start_str = datetime.fromtimestamp(start_time, tz=TZ).strftime("%A %Y-%m-%d %I:%M %p EST")
+        end_str = datetime.fromtimestamp(end_time, tz=TZ).strftime("%A %Y-%m-%d %I:%M %p EST")
         print(f"  {start_str} → {end_str}")
     print()
 
-    # Earliest timestamp — pagination stops once we pass this
+    # Only ask Riot for matches between the first window's start and the last window's end
     earliest_timestamp = windows[0][0]
+    latest_timestamp = windows[-1][1]
+    earliest_date = datetime.fromtimestamp(earliest_timestamp, tz=TZ).strftime("%m/%d/%Y")
+    latest_date = datetime.fromtimestamp(latest_timestamp, tz=TZ).strftime("%m/%d/%Y")
 
     all_match_ids = set()
+    history_queues = get_history_queues(CUSTOM_QUEUE_IDS, FILTER_QUEUES_SERVER_SIDE)
     all_rows = []
+    all_rows_extend = all_rows.extend  # bound once, called for every inhouse match
 
     # Step 1: Convert Riot IDs to PUUIDs and collect match IDs
     for i, riot_id in enumerate(PLAYER_RIOT_IDS, 1):
         print(f"[{i}/{len(PLAYER_RIOT_IDS)}] Looking up: {riot_id}")
 
         puuid = get_puuid_from_riot_id(riot_id)
-        time.sleep(API_DELAY)
 
         if not puuid:
             continue
 
         print(f"  PUUID: {puuid[:30]}...")
-        print(f"  Paginating match history back to {datetime.fromtimestamp(earliest_timestamp, tz=tz).strftime('%m/%d/%Y')}...")
+        print(f"  Fetching match history from {earliest_date} to {latest_date}...")
 
-        match_ids = get_all_match_ids(puuid, earliest_timestamp)
+        match_ids = []
+        for queue in history_queues:
+            match_ids += get_all_match_ids(puuid, earliest_timestamp, latest_timestamp, queue)
 
         if match_ids:
-            new_ids = set(match_ids) - all_match_ids
+            before = len(all_match_ids)
             all_match_ids.update(match_ids)
-            print(f"  Total: {len(match_ids)} matches, {len(new_ids)} new unique")
+            print(f"  Total: {len(match_ids)} matches, {len(all_match_ids) - before} new unique")
         else:
             print("  No matches found")
 
         print()
 
+    # Drop IDs from other shards before spending a detail request on them
+    match_id_prefix = f"{PLATFORM}_"
+    wrong_shard = {m for m in all_match_ids if not m.startswith(match_id_prefix)}
+    all_match_ids -= wrong_shard
+
     print(f"{'='*60}")
     print(f"Total unique matches to check: {len(all_match_ids)}")
+    if wrong_shard:
+        print(f"Skipped {len(wrong_shard)} match(es) from other shards")
     print(f"{'='*60}\n")
 
     # Step 2: Get details for each match, filter for inhouse games on target dates
@@ -476,38 +309,34 @@ def main():
     skipped_wrong_date = 0
     skipped_wrong_type = 0
 
-    for i, match_id in enumerate(sorted(all_match_ids), 1):
-        print(f"[{i}/{len(all_match_ids)}] Fetching match: {match_id}")
-        match_data = get_match_details(match_id)
-        time.sleep(API_DELAY)
+    match_ids = sorted(all_match_ids)
+    print(f"Fetching {len(match_ids)} match(es) concurrently...")
+    results = await fetch_match_details(match_ids)
+
+    for i, (match_id, match_data) in enumerate(zip(match_ids, results), 1):
+        print(f"[{i}/{len(match_ids)}] Match: {match_id}")
 
         if not match_data:
             continue
 
-        if is_inhouse_game(match_data, windows):
+        info = match_data.get("info", {})
+        game_start_ts = info.get("gameStartTimestamp", 0) / 1000
+        game_date = datetime.fromtimestamp(game_start_ts, tz=TZ).strftime("%m/%d %I:%M %p")
+
+        if is_inhouse_game(match_data, starts, ends, CUSTOM_QUEUE_IDS):
             custom_count += 1
             stats = extract_stats(match_data)
-            all_rows.extend(stats)
-            game_info = match_data.get("info", {})
-            duration = round(game_info.get("gameDuration", 0) / 60, 1)
-            queue = game_info.get("queueId", "?")
-            game_start_ts = game_info.get("gameStartTimestamp", 0) / 1000
-            game_date = datetime.fromtimestamp(game_start_ts, tz=tz).strftime("%m/%d %I:%M %p")
+            all_rows_extend(stats)
+            duration = round(info.get("gameDuration", 0) / 60, 1)
+            queue = info.get("queueId", "?")
             print(f"  ✓ Inhouse game! {game_date} | Queue: {queue} | Duration: {duration} min | {len(stats)} players")
         else:
-            info = match_data.get("info", {})
-            queue_id = info.get("queueId", "?")
-            game_type = info.get("gameType", "?")
-            game_start_ts = info.get("gameStartTimestamp", 0) / 1000
-            game_date = datetime.fromtimestamp(game_start_ts, tz=tz).strftime("%m/%d %I:%M %p")
-
-            is_custom = queue_id in CUSTOM_QUEUE_IDS or game_type == "CUSTOM_GAME"
-            if is_custom:
+            if is_custom_game(info, CUSTOM_QUEUE_IDS):
                 skipped_wrong_date += 1
                 print(f"  ✗ Custom game but wrong date ({game_date})")
             else:
                 skipped_wrong_type += 1
-                print(f"  ✗ Not a custom game (queueId: {queue_id})")
+                print(f"  ✗ Not a custom game (queueId: {info.get('queueId', '?')})")
 
     print(f"\n{'='*60}")
     print(f"RESULTS SUMMARY")
@@ -521,12 +350,14 @@ def main():
     # Step 3: Write to Google Sheets
     if all_rows:
         print(f"\nConnecting to Google Sheets...")
-        worksheet = connect_to_sheet()
-        write_to_sheet(worksheet, all_rows)
+        df = build_stats_frame(all_rows)
+        worksheet = connect_to_sheet(GOOGLE_CREDENTIALS_FILE, SPREADSHEET_NAME, WORKSHEET_NAME)
+        # astype(object) hands back plain Python ints/floats, which the Sheets JSON body needs
+        write_to_sheet(worksheet, df.astype(object).values.tolist(), mode="tournament")
         print("\nDone! Check your spreadsheet.")
     else:
         print("\nNo inhouse games found for these date windows.")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())